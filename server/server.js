@@ -4,8 +4,10 @@
 import express from 'express';
 import cors from 'cors';
 import fetch from 'node-fetch';
+import fs from 'fs';
+import http from 'http';
+import https from 'https';
 import path from 'path';
-import crypto from 'crypto';
 import { fileURLToPath } from 'url';
 import dotenv from 'dotenv';
 import { XMLParser } from 'fast-xml-parser';
@@ -22,11 +24,14 @@ const app = express();
 app.use(cors());
 app.use(express.json({ limit: '1mb' }));
 
-// Log every request (helpful for debugging)
-app.use((req, _res, next) => {
-  console.log(`[REQ] ${req.method} ${req.url}`);
-  next();
-});
+// Log every request (helpful for debugging) — opt-in so production hot
+// paths don't pay a console write per request.
+if ((process.env.LOG_REQUESTS || '').toLowerCase() === 'true') {
+  app.use((req, _res, next) => {
+    console.log(`[REQ] ${req.method} ${req.url}`);
+    next();
+  });
+}
 
 // ---------- Config ----------
 const {
@@ -45,8 +50,15 @@ const {
 
   // News
   NEWS_CACHE_TTL = '300',      // seconds
+
+  // Single-ticker analysis
+  ANALYZE_CACHE_TTL = '300',   // seconds
 } = process.env;
 
+// Normalize the fallback flag once at startup instead of lowercasing the
+// env string on every error path.
+const MOCK_FALLBACK_ON = (MOCK_FALLBACK || 'true').toLowerCase() === 'true';
+
 console.log(`GROQ key loaded? ${GROQ_API_KEY ? 'yes' : 'NO'} (key starts with: ${(GROQ_API_KEY || '').slice(0,5)})`);
 console.log(`Using Groq Base URL: ${GROQ_BASE_URL}`);
 if (GROQ_MODEL) console.log(`Using primary Groq Model: ${GROQ_MODEL}`);
@@ -57,6 +69,13 @@ const WEB_DIR = path.join(__dirname, '..', 'web');
 // ---------- Helpers ----------
 const TICKER_RE = /^[A-Z][A-Z0-9.\-]{0,9}$/;
 
+// Keep-alive agents shared by all outbound calls (Groq, series providers,
+// RSS) so repeat requests to the same hosts reuse TCP/TLS connections
+// instead of paying a fresh handshake each time.
+const httpAgent = new http.Agent({ keepAlive: true, maxSockets: 32 });
+const httpsAgent = new https.Agent({ keepAlive: true, maxSockets: 32 });
+const keepAlive = (url) => (url.protocol === 'http:' ? httpAgent : httpsAgent);
+
 const MOCK = {
   summary: 'Mixed risk-on tone; mega-cap tech consolidating while cyclicals bid.',
   buy: [
@@ -102,7 +121,8 @@ const PREFERRED_MODELS = [
 
 async function listGroqModels() {
   const r = await fetch(`${GROQ_BASE_URL}/models`, {
-    headers: { Authorization: `Bearer ${GROQ_API_KEY}` }
+    headers: { Authorization: `Bearer ${GROQ_API_KEY}` },
+    agent: keepAlive,
   });
   const raw = await r.text().catch(() => '');
   if (!r.ok) {
@@ -119,7 +139,8 @@ async function resolveGroqModel() {
   if (RESOLVED_GROQ_MODEL) return RESOLVED_GROQ_MODEL;
   try {
     const ids = await listGroqModels();
-    const pick = PREFERRED_MODELS.find(id => ids.includes(id)) || ids[0];
+    const idSet = new Set(ids); // O(1) membership while walking preferences
+    const pick = PREFERRED_MODELS.find(id => idSet.has(id)) || ids[0];
     if (!pick) throw new Error('No models available for this key.');
     RESOLVED_GROQ_MODEL = pick;
     console.log(`[Groq] Auto-resolved model: ${RESOLVED_GROQ_MODEL}`);
@@ -159,6 +180,7 @@ async function groqJSON(messages) {
         },
         body: JSON.stringify(body),
         signal: controller.signal,
+        agent: keepAlive,
       });
       raw = await res.text().catch(() => '');
     } catch (e) {
@@ -179,7 +201,8 @@ async function groqJSON(messages) {
       if (decommissioned) {
         console.log(`[Groq] Primary model '${modelId}' failed. Attempting fallback…`);
         const available = await listGroqModels();
-        const next = PREFERRED_MODELS.find(id => id !== modelId && available.includes(id)) ||
+        const availableSet = new Set(available);
+        const next = PREFERRED_MODELS.find(id => id !== modelId && availableSet.has(id)) ||
                      available.find(id => id !== modelId);
         if (next) {
           console.log(`[Groq] Attempt 2 with model: ${next}`);
@@ -223,7 +246,7 @@ function toSeries(ticker, rows) {
 async function fetchSeriesYahoo(ticker, days) {
   const range = days <= 30 ? '1mo' : days <= 90 ? '3mo' : days <= 180 ? '6mo' : '1y';
   const url = `https://query1.finance.yahoo.com/v8/finance/chart/${encodeURIComponent(ticker)}?range=${range}&interval=1d&includePrePost=false`;
-  const res = await fetch(url, { headers: { 'User-Agent': 'TradeSense/1.0' } });
+  const res = await fetch(url, { headers: { 'User-Agent': 'TradeSense/1.0' }, agent: keepAlive });
   if (!res.ok) throw new Error(`Yahoo ${res.status}`);
   const j = await res.json();
   const r = j?.chart?.result?.[0];
@@ -237,7 +260,7 @@ async function fetchSeriesYahoo(ticker, days) {
 async function fetchSeriesAlphaVantage(ticker, days) {
   if (!ALPHAVANTAGE_API_KEY) throw new Error('Missing ALPHAVANTAGE_API_KEY');
   const url = `https://www.alphavantage.co/query?function=TIME_SERIES_DAILY_ADJUSTED&symbol=${encodeURIComponent(ticker)}&outputsize=compact&apikey=${ALPHAVANTAGE_API_KEY}`;
-  const res = await fetch(url);
+  const res = await fetch(url, { agent: keepAlive });
   if (!res.ok) throw new Error(`AlphaVantage ${res.status}`);
   const j = await res.json();
   const series = j['Time Series (Daily)'];
@@ -256,25 +279,61 @@ async function fetchSeriesPolygon(ticker, days) {
   const start = new Date(end.getTime() - (days + 5) * 24 * 3600 * 1000);
   const fmt = (d) => d.toISOString().slice(0, 10);
   const url = `https://api.polygon.io/v2/aggs/ticker/${encodeURIComponent(ticker)}/range/1/day/${fmt(start)}/${fmt(end)}?adjusted=true&sort=asc&limit=50000&apiKey=${POLYGON_API_KEY}`;
-  const res = await fetch(url);
+  const res = await fetch(url, { agent: keepAlive });
   if (!res.ok) throw new Error(`Polygon ${res.status}`);
   const j = await res.json();
   const rows = (j?.results || []).map(bar => ({ t: Number(bar.t), close: Number(bar.c) })).slice(-days);
   return toSeries(ticker, rows);
 }
 
-// Cache + basic per-ticker throttle
-const seriesCache = new Map(); // key -> {expires, data}
+// One TTL cache implementation for series/news/analyze. Pass a snapshot
+// file to persist warm entries across restarts.
+function makeTtlCache(label, file = null) {
+  const map = new Map(); // key -> {expires, data}
+  if (file) {
+    try {
+      const saved = JSON.parse(fs.readFileSync(file, 'utf8'));
+      for (const [key, v] of Object.entries(saved)) {
+        if (v && Date.now() < v.expires) map.set(key, v);
+      }
+    } catch { /* no snapshot yet, or unreadable — start cold */ }
+  }
+  // Debounced: a burst of sets (e.g. a cold batch fetch) coalesces into one
+  // async write shortly after, instead of a synchronous full-file rewrite on
+  // the request path per set.
+  let saveTimer = null;
+  const save = () => {
+    if (!file || saveTimer) return;
+    saveTimer = setTimeout(async () => {
+      saveTimer = null;
+      try {
+        await fs.promises.mkdir(path.dirname(file), { recursive: true });
+        await fs.promises.writeFile(file, JSON.stringify(Object.fromEntries(map)));
+      } catch (e) { console.error(`[${label}] cache snapshot failed:`, e.message); }
+    }, 100);
+    saveTimer.unref?.();
+  };
+  return {
+    get(key) { const v = map.get(key); if (!v) return null; if (Date.now() > v.expires) { map.delete(key); return null; } return v.data; },
+    set(key, data, ttl) { map.set(key, { expires: Date.now() + ttl * 1000, data }); save(); },
+  };
+}
+
+// Series cache + basic per-ticker throttle
+const seriesCache = makeTtlCache('series', path.join(__dirname, '.cache', 'series.json'));
 const lastHit = new Map();     // ticker -> timestamp
-function cacheGet(key) { const v = seriesCache.get(key); if (!v) return null; if (Date.now() > v.expires) { seriesCache.delete(key); return null; } return v.data; }
-function cacheSet(key, data, ttl) { seriesCache.set(key, { expires: Date.now() + ttl * 1000, data }); }
+// Per-ticker throttle shared by the single and batch series forms.
+function throttled(tkr, ms = 10000) {
+  const now = Date.now();
+  const prev = lastHit.get(tkr) || 0;
+  if (now - prev < ms) return true;
+  lastHit.set(tkr, now);
+  return false;
+}
 function rateLimitMs(ms = 10000) {
   return (req, res, next) => {
     const tkr = String(req.query.ticker || '').toUpperCase();
-    const now = Date.now();
-    const prev = lastHit.get(tkr) || 0;
-    if (tkr && now - prev < ms) return res.status(429).json({ error: 'Too many requests for this ticker. Try again shortly.' });
-    lastHit.set(tkr, now);
+    if (tkr && throttled(tkr, ms)) return res.status(429).json({ error: 'Too many requests for this ticker. Try again shortly.' });
     next();
   };
 }
@@ -298,34 +357,68 @@ function pickImageFromItem(item) {
 function domainFromLink(link = '') { try { return new URL(link).hostname.replace(/^www\./, ''); } catch { return ''; } }
 function dedupeByLink(items) { const seen = new Set(); return items.filter(i => (i.link && !seen.has(i.link)) ? (seen.add(i.link), true) : false); }
 
+// Conditional-GET state per feed: validators + last parsed items, so an
+// unchanged feed costs a 304 instead of a full download + XML parse.
+const rssConditional = new Map(); // url -> {etag, lastModified, items}
+
 async function fetchOneRss({ name, url }) {
-  const res = await fetch(url, { headers: { 'User-Agent': 'TradeSense/1.0' } });
-  if (!res.ok) throw new Error(`RSS ${name} ${res.status}`);
-  const xml = await res.text();
+  // Feeds are fetched in parallel, so aggregate latency is max(feed) — bound it
+  // so one hung feed can't stall the whole /api/news response.
+  const controller = new AbortController();
+  const timeout = setTimeout(() => controller.abort(), 8000); // 8s per feed
+  const prev = rssConditional.get(url);
+  const headers = { 'User-Agent': 'TradeSense/1.0' };
+  if (prev?.etag) headers['If-None-Match'] = prev.etag;
+  if (prev?.lastModified) headers['If-Modified-Since'] = prev.lastModified;
+  let res, xml = '';
+  try {
+    res = await fetch(url, { headers, signal: controller.signal, agent: keepAlive });
+    if (res.status === 304 && prev) return prev.items;
+    if (!res.ok) throw new Error(`RSS ${name} ${res.status}`);
+    xml = await res.text(); // inside the try so the abort timer covers the body read too
+  } catch (e) {
+    if (e.name === 'AbortError') throw new Error(`RSS ${name} timed out`);
+    throw e;
+  } finally {
+    clearTimeout(timeout);
+  }
   const j = xmlParser.parse(xml);
   const channel = j?.rss?.channel || j?.feed;
   const items = channel?.item || channel?.entry || [];
-  return (Array.isArray(items) ? items : [items]).map(it => {
+  const now = Date.now(); // one clock read per feed, not per dateless item
+  const parsed = (Array.isArray(items) ? items : [items]).flatMap(it => {
     const link = it.link?.href || it.link || it.guid || '';
+    const href = typeof link === 'string' ? link : (link?.['#text'] || '');
+    // dedupeByLink discards linkless items anyway — skip them before doing
+    // any per-item string work or allocation.
+    if (!href) return [];
     const title = it.title?._text || it.title || '';
     const desc = it.description?._text || it.description || it.summary || '';
     const pub = it.pubDate || it.published || it.updated || null;
     return {
       source: name,
       title: String(title).trim(),
-      description: String(desc).replace(/<[^>]+>/g, '').trim(),
-      link: typeof link === 'string' ? link : (link?.['#text'] || ''),
-      publishedAt: pub ? new Date(pub).getTime() : Date.now(),
+      description: desc ? String(desc).replace(/<[^>]+>/g, '').trim() : '',
+      link: href,
+      publishedAt: pub ? new Date(pub).getTime() : now,
       image: pickImageFromItem(it),
-      domain: '' // filled below
+      domain: domainFromLink(href),
     };
-  }).map(x => ({ ...x, domain: domainFromLink(x.link) }));
+  });
+  rssConditional.set(url, {
+    etag: res.headers.get('etag') || null,
+    lastModified: res.headers.get('last-modified') || null,
+    items: parsed,
+  });
+  return parsed;
 }
 
-// tiny news cache
-const newsCache = new Map(); // key -> {expires, data}
-function newsCacheGet(key){ const v=newsCache.get(key); if(!v) return null; if(Date.now()>v.expires){newsCache.delete(key); return null;} return v.data; }
-function newsCacheSet(key,data,ttl){ newsCache.set(key,{expires:Date.now()+ttl*1000,data}); }
+// tiny news cache — snapshotted to disk so a warm cache survives restarts
+const newsCache = makeTtlCache('news', path.join(__dirname, '.cache', 'news.json'));
+
+// Coalesce concurrent cache misses: requests arriving while the feeds are
+// already being fetched piggyback on the same promise instead of refetching.
+const newsInFlight = new Map(); // key -> Promise<payload>
 
 // ---------- Routes ----------
 
@@ -333,7 +426,8 @@ function newsCacheSet(key,data,ttl){ newsCache.set(key,{expires:Date.now()+ttl*1
 app.get('/api/debug/models', async (_req, res) => {
   try {
     const r = await fetch(`${GROQ_BASE_URL}/models`, {
-      headers: { Authorization: `Bearer ${GROQ_API_KEY}` }
+      headers: { Authorization: `Bearer ${GROQ_API_KEY}` },
+      agent: keepAlive,
     });
     const text = await r.text();
     res.status(r.status).type('application/json').send(text);
@@ -353,7 +447,7 @@ app.post('/api/screen', async (req, res) => {
     return res.json(withMockFlag(json, false));
   } catch (err) {
     console.error('Error in /api/screen:', err.message);
-    if ((MOCK_FALLBACK || 'true').toLowerCase() === 'true') {
+    if (MOCK_FALLBACK_ON) {
       return res.json(withMockFlag({
         ...MOCK,
         summary: `[MOCK DATA DUE TO API ERROR]: ${err.message}\n` + MOCK.summary
@@ -363,20 +457,46 @@ app.post('/api/screen', async (req, res) => {
   }
 });
 
-// Analyze single ticker
+// Analyze single ticker — cached per ticker so repeated lookups of the same
+// symbol (watchlist clicks, compare) don't burn extra Groq round trips.
+const analyzeCache = makeTtlCache('analyze'); // ticker -> payload, in-memory only
+
+async function analyzeOne(ticker) {
+  const cached = analyzeCache.get(ticker);
+  if (cached) return cached;
+
+  const json = await groqJSON([
+    { role: 'system', content: SYSTEM_PROMPT },
+    { role: 'user', content: makeSingleTickerPrompt(ticker) },
+  ]);
+  const payload = withMockFlag(json, false);
+  analyzeCache.set(ticker, payload, Number(ANALYZE_CACHE_TTL) || 300);
+  return payload;
+}
+
 app.post('/api/analyze', async (req, res) => {
   try {
+    // Bulk form: { tickers: [...] } analyzes a whole list concurrently,
+    // so comparing N symbols costs max(latency), not sum.
+    if (Array.isArray(req.body?.tickers)) {
+      const tickers = [...new Set(req.body.tickers.map(t => String(t || '').toUpperCase().trim()))].filter(Boolean).slice(0, 5);
+      if (!tickers.length || !tickers.every(t => TICKER_RE.test(t))) {
+        return res.status(400).json({ error: 'Provide a list of valid tickers (e.g., ["AAPL","MSFT"]).' });
+      }
+      const settled = await Promise.allSettled(tickers.map(analyzeOne));
+      const items = settled.map((r, i) => r.status === 'fulfilled'
+        ? { ticker: tickers[i], ...r.value }
+        : { ticker: tickers[i], error: r.reason?.message || 'analysis failed' });
+      return res.json({ items });
+    }
+
     const ticker = String(req.body?.ticker || '').toUpperCase().trim();
     if (!TICKER_RE.test(ticker)) return res.status(400).json({ error: 'Provide a valid ticker (e.g., AAPL, BRK.B).' });
 
-    const json = await groqJSON([
-      { role: 'system', content: SYSTEM_PROMPT },
-      { role: 'user', content: makeSingleTickerPrompt(ticker) },
-    ]);
-    return res.json(withMockFlag(json, false));
+    return res.json(await analyzeOne(ticker));
   } catch (err) {
     console.error('Error in /api/analyze:', err.message);
-    if ((MOCK_FALLBACK || 'true').toLowerCase() === 'true') {
+    if (MOCK_FALLBACK_ON) {
       return res.json(withMockFlag({
         ...MOCK,
         summary: `[MOCK DATA DUE TO API ERROR]: ${err.message}\n` + MOCK.summary
@@ -386,24 +506,51 @@ app.post('/api/analyze', async (req, res) => {
   }
 });
 
-// Price series
+// Fetch one ticker's series through the configured provider, with caching.
+async function fetchSeriesCached(ticker, days) {
+  // The composite string is already a unique, cheap Map key — no need to
+  // round-trip it through a hash digest.
+  const key = `${SERIES_PROVIDER}|${ticker}|${days}`;
+  const cached = seriesCache.get(key);
+  if (cached) return cached;
+
+  let out;
+  if (SERIES_PROVIDER === 'polygon') out = await fetchSeriesPolygon(ticker, days);
+  else if (SERIES_PROVIDER === 'alphavantage') out = await fetchSeriesAlphaVantage(ticker, days);
+  else out = await fetchSeriesYahoo(ticker, days); // default
+
+  seriesCache.set(key, out, Number(SERIES_CACHE_TTL) || 900);
+  return out;
+}
+
+// Price series — single ticker (?ticker=AAPL) or batch (?tickers=AAPL,MSFT)
 app.get('/api/series', rateLimitMs(10000), async (req, res) => {
   try {
-    const ticker = String(req.query.ticker || '').toUpperCase();
     const days = Math.max(30, Math.min(365, Number(req.query.days || 180)));
-    if (!TICKER_RE.test(ticker)) return res.status(400).json({ error: 'Invalid ticker' });
-
-    const key = crypto.createHash('md5').update(`${SERIES_PROVIDER}|${ticker}|${days}`).digest('hex');
-    const cached = cacheGet(key);
-    if (cached) return res.json(cached);
 
-    let out;
-    if (SERIES_PROVIDER === 'polygon') out = await fetchSeriesPolygon(ticker, days);
-    else if (SERIES_PROVIDER === 'alphavantage') out = await fetchSeriesAlphaVantage(ticker, days);
-    else out = await fetchSeriesYahoo(ticker, days); // default
+    if (req.query.tickers) {
+      const tickers = [...new Set(String(req.query.tickers).toUpperCase().split(',').map(s => s.trim()).filter(Boolean))].slice(0, 10);
+      if (!tickers.length || !tickers.every(t => TICKER_RE.test(t))) {
+        return res.status(400).json({ error: 'Invalid tickers list' });
+      }
+      // One round trip for the whole batch: fetch all misses concurrently.
+      // Each ticker still pays the same per-ticker throttle as the single
+      // form, and failures surface as { ticker, error } entries like bulk
+      // /api/analyze does.
+      const settled = await Promise.allSettled(tickers.map(t =>
+        throttled(t)
+          ? Promise.reject(new Error('Too many requests for this ticker. Try again shortly.'))
+          : fetchSeriesCached(t, days)
+      ));
+      const items = settled.map((r, i) => r.status === 'fulfilled'
+        ? r.value
+        : { ticker: tickers[i], error: r.reason?.message || 'series fetch failed' });
+      return res.json({ items });
+    }
 
-    cacheSet(key, out, Number(SERIES_CACHE_TTL) || 900);
-    res.json(out);
+    const ticker = String(req.query.ticker || '').toUpperCase();
+    if (!TICKER_RE.test(ticker)) return res.status(400).json({ error: 'Invalid ticker' });
+    res.json(await fetchSeriesCached(ticker, days));
   } catch (e) {
     console.error('[series]', e.message);
     res.status(502).json({ error: 'Series provider failed', detail: e.message });
@@ -411,31 +558,38 @@ app.get('/api/series', rateLimitMs(10000), async (req, res) => {
 });
 
 // News
+// Fetch, dedupe and sort all feeds once per TTL; every query filters the
+// same cached list. Each item carries a lowercased haystack (searchText)
+// computed once at parse time so filtering is a single includes() per item.
+async function getAllNews() {
+  const cached = newsCache.get('all');
+  if (cached) return cached;
+
+  let pending = newsInFlight.get('all');
+  if (!pending) {
+    pending = (async () => {
+      const all = (await Promise.allSettled(NEWS_SOURCES.map(fetchOneRss)))
+        .flatMap(r => r.status === 'fulfilled' ? r.value : []);
+      const news = dedupeByLink(all)
+        .sort((a,b) => b.publishedAt - a.publishedAt)
+        .map(n => ({ ...n, searchText: `${n.title}\n${n.description}\n${n.source}\n${n.domain}`.toLowerCase() }));
+      newsCache.set('all', news, Number(NEWS_CACHE_TTL) || 300);
+      return news;
+    })();
+    newsInFlight.set('all', pending);
+    pending.finally(() => newsInFlight.delete('all'));
+  }
+  return pending;
+}
+
 app.get('/api/news', async (req, res) => {
   const limit = Math.max(6, Math.min(50, Number(req.query.limit || 18)));
   const q = String(req.query.q || '').toLowerCase().trim();
-  const cacheKey = JSON.stringify({ limit, q });
-
-  const cached = newsCacheGet(cacheKey);
-  if (cached) return res.json(cached);
 
   try {
-    const all = (await Promise.allSettled(NEWS_SOURCES.map(fetchOneRss)))
-      .flatMap(r => r.status === 'fulfilled' ? r.value : []);
-    let news = dedupeByLink(all).sort((a,b) => b.publishedAt - a.publishedAt);
-
-    if (q) {
-      news = news.filter(n =>
-        n.title.toLowerCase().includes(q) ||
-        n.description.toLowerCase().includes(q) ||
-        n.source.toLowerCase().includes(q) ||
-        n.domain.toLowerCase().includes(q)
-      );
-    }
-
-    const payload = { items: news.slice(0, limit) };
-    newsCacheSet(cacheKey, payload, Number(NEWS_CACHE_TTL) || 300);
-    res.json(payload);
+    let news = await getAllNews();
+    if (q) news = news.filter(n => n.searchText.includes(q));
+    res.json({ items: news.slice(0, limit).map(({ searchText, ...n }) => n) });
   } catch (e) {
     console.error('[news]', e.message);
     res.status(502).json({ error: 'News fetch failed', detail: e.message });
@@ -35,13 +35,9 @@ let watchlist = JSON.parse(localStorage.getItem('ts.watchlist') || '[]');
 let compareTickers = [];
 
 // -------------------- helpers --------------------
+const ESC_MAP = { '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;' };
 function esc(s = '') {
-  return String(s)
-    .replaceAll('&', '&amp;')
-    .replaceAll('<', '&lt;')
-    .replaceAll('>', '&gt;')
-    .replaceAll('"', '&quot;')
-    .replaceAll("'", '&#39;');
+  return String(s).replace(/[&<>"']/g, (c) => ESC_MAP[c]);
 }
 
 function confBarHTML(conf = 0) {
@@ -85,15 +81,17 @@ function stockCardHTML(s) {
   `;
 }
 
+// One delegated click listener per container, attached once — renders are
+// then a single innerHTML write with no per-button wiring pass.
+function delegate(el, attr, fn) {
+  el?.addEventListener('click', (e) => {
+    const btn = e.target.closest(`[${attr}]`);
+    if (btn && el.contains(btn)) fn(btn.getAttribute(attr));
+  });
+}
+
 function renderLane(listEl, items) {
   listEl.innerHTML = items.map(stockCardHTML).join('');
-  // wire buttons
-  listEl.querySelectorAll('[data-watch]').forEach(b =>
-    b.addEventListener('click', () => addToWatch(b.getAttribute('data-watch')))
-  );
-  listEl.querySelectorAll('[data-compare]').forEach(b =>
-    b.addEventListener('click', () => addCompareTicker(b.getAttribute('data-compare')))
-  );
 }
 
 function renderAll(json) {
@@ -205,8 +203,6 @@ function renderWatch() {
       </div>
     </div>
   `).join('');
-  watchItems.querySelectorAll('[data-an]').forEach(b => b.addEventListener('click', () => analyzeTicker(b.getAttribute('data-an'))));
-  watchItems.querySelectorAll('[data-rm]').forEach(b => b.addEventListener('click', () => removeFromWatch(b.getAttribute('data-rm'))));
 }
 function addCompareTicker(t){ t=(t||'').toUpperCase(); if(!t) return; if(!compareTickers.includes(t)) compareTickers.push(t); renderCompareList(); }
 function removeCompareTicker(t){ compareTickers = compareTickers.filter(x=>x!==t); renderCompareList(); }
@@ -219,7 +215,6 @@ function renderCompareList(){
       <button class="btn" data-del="${t}">Remove</button>
     </div>
   `).join('');
-  compareList.querySelectorAll('[data-del]').forEach(b => b.addEventListener('click', () => removeCompareTicker(b.getAttribute('data-del'))));
 }
 function runCompare(){ /* charts removed — keep list only */ }
 
@@ -236,6 +231,13 @@ compareForm?.addEventListener('submit', (e) => {
   if (v) { addCompareTicker(v); compareInput.value=''; }
 });
 compareRunBtn?.addEventListener('click', runCompare);
+[buyList, holdList, sellList, utrList].forEach(el => {
+  delegate(el, 'data-watch', addToWatch);
+  delegate(el, 'data-compare', addCompareTicker);
+});
+delegate(watchItems, 'data-an', analyzeTicker);
+delegate(watchItems, 'data-rm', removeFromWatch);
+delegate(compareList, 'data-del', removeCompareTicker);
 
 // initial renders
 renderWatch();
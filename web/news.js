@@ -6,16 +6,11 @@ document.addEventListener('DOMContentLoaded', () => {
 
   function log(msg, extra) {
     console.log('[news]', msg, extra || '');
-    const el = document.createElement('div');
-    el.className = 'card';
-    el.style.fontSize = '12px';
-    el.textContent = `[news] ${msg}`;
-    // comment the next line after debugging if it's too noisy
-    // grid.prepend(el);
   }
 
   function timeAgo(ts) {
-    const d = Date.now() - Number(ts || 0);
+    if (!ts) return ''; // no timestamp — better blank than "19000d ago"
+    const d = Date.now() - Number(ts);
     const mins = Math.max(0, Math.floor(d / 60000));
     if (mins < 60) return `${mins}m ago`;
     const hrs = Math.floor(mins / 60);